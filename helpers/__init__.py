@@ -1,5 +1,28 @@
-from .config import load_config, save_config, global_config
-from .pdf_annotation import annotate_pdf_pages
-from .enrichments import enrich_json_with_summaries
-from .generate_markdown import create_markdowns
-from .file_and_folder import get_pdf_page_count, get_json_file_elements, get_files_with_extension
\ No newline at end of file
+import importlib
+
+from .config import load_config, reload_config, save_config, global_config
+
+# Helpers that pull in heavy dependencies (PyMuPDF, openai, rich, ...) are
+# imported on first access (PEP 562) so that importing the package stays cheap.
+_LAZY_ATTRIBUTES = {
+    'annotate_pdf_pages': '.pdf_annotation',
+    'enrich_json_with_summaries': '.enrichments',
+    'create_markdowns': '.generate_markdown',
+    'get_pdf_page_count': '.file_and_folder',
+    'get_json_file_elements': '.file_and_folder',
+    'get_files_with_extension': '.file_and_folder',
+    'scan_files_with_extension': '.file_and_folder',
+}
+
+__all__ = ['load_config', 'reload_config', 'save_config', 'global_config', *_LAZY_ATTRIBUTES]
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -22,12 +22,19 @@ Usage:
 import configparser
 import logging
 import os
+import re
 import sys
 import json
 from types import SimpleNamespace
 
 global_config = SimpleNamespace()
 
+# Path of the config file global_config was last loaded from, or None
+_loaded_config_path = None
+
+_SECTION_RE = re.compile(r'^\[(.+?)\]\s*$')
+_KV_RE = re.compile(r'^\s*([^=;#]+?)\s*=\s*(.*?)\s*$')
+
 DEFAULT_CONFIG = """
 [API_KEYS]
 UNSTRUCTURED_API_KEY = your_unstructured_api_key_here
@@ -40,6 +47,9 @@ OUTPUT_DIR = ./output
 [PDF_PROCESSING]
 SAVE_IMAGES = True
 SAVE_DOCUMENT_ELEMENTS = True
+
+[PARTITIONING]
+USE_LOCAL_GPU = False
 """
 
 def create_default_config(config_path):
@@ -53,17 +63,54 @@ def create_default_config(config_path):
         config_file.write(DEFAULT_CONFIG)
     logging.info(f"Created default config file at {config_path}")
 
+def read_config_file(config_path):
+    """
+    Parse a flat INI file into a dictionary of sections.
+
+    Only the subset of INI used by config.ini is supported: `[SECTION]`
+    headers followed by `key = value` lines. Keys are lower-cased, as
+    configparser does, and lines starting with `#` or `;` are ignored.
+
+    Args:
+        config_path (str): Path to the configuration file.
+
+    Returns:
+        dict: Mapping of section name to a dict of key/value pairs.
+    """
+    config = {}
+    section = None
+    with open(config_path, 'r', encoding='utf-8') as config_file:
+        for line in config_file:
+            stripped = line.strip()
+            if not stripped or stripped[0] in '#;':
+                continue
+            match = _SECTION_RE.match(stripped)
+            if match:
+                section = config.setdefault(match.group(1), {})
+                continue
+            match = _KV_RE.match(line)
+            if match and section is not None:
+                section[match.group(1).lower()] = match.group(2)
+    return config
+
 def load_config(config_path='config.ini'):
     """
     Load configuration from config.ini file.
 
+    The parsed configuration is cached; subsequent calls for the same file
+    return global_config without touching the disk. Use `reload_config()`
+    to force the file to be read again.
+
     Args:
         config_path (str): Path to the configuration file.
 
     Returns:
         GlobalConfig: The loaded global configuration.
     """
-    global global_config
+    global global_config, _loaded_config_path
+    
+    if _loaded_config_path == config_path:
+        return global_config
     
     if not os.path.exists(config_path):
         logging.warning(f"Config file not found at {config_path}. Creating default config.")
@@ -71,8 +118,7 @@ def load_config(config_path='config.ini'):
         print(f"A default configuration file has been created at {config_path}")
         print("Please edit this file to add your API keys before running the program again.")
         sys.exit(1)
-    config = configparser.ConfigParser()
-    config.read(config_path)
+    config = read_config_file(config_path)
     
     # Check for critical parameters
     critical_params = [
@@ -86,10 +132,9 @@ def load_config(config_path='config.ini'):
     default_params = []
     
     for section, key, default_value in critical_params:
-        if not config.has_section(section):
-            config.add_section(section)
-        if not config.has_option(section, key):
-            config.set(section, key, default_value)
+        options = config.setdefault(section, {})
+        if key not in options:
+            options[key] = default_value
             missing_params.append(f"{section}.{key}")
     
     if missing_params:
@@ -102,11 +147,11 @@ def load_config(config_path='config.ini'):
         print("Please update these values in your config.ini file before running the program.")
         sys.exit(1)
     
-    for section in config.sections():
+    for section, options in config.items():
         # Create a namespace for each section
         section_namespace = SimpleNamespace()
         
-        for key, value in config.items(section):
+        for key, value in options.items():
             # Set each key-value pair in the namespace
             setattr(section_namespace, key, value)
         
@@ -134,8 +179,23 @@ def load_config(config_path='config.ini'):
     
     logging.info("Configuration loaded successfully")
     
+    _loaded_config_path = config_path
     return global_config
 
+def reload_config(config_path='config.ini'):
+    """
+    Discard the cached configuration and load it again from disk.
+
+    Args:
+        config_path (str): Path to the configuration file.
+
+    Returns:
+        GlobalConfig: The reloaded global configuration.
+    """
+    global _loaded_config_path
+    _loaded_config_path = None
+    return load_config(config_path)
+
 def save_config():
     """
     Save the global configuration back to config.ini.
@@ -0,0 +1,102 @@
+"""
+-----------------------------------------------------------------
+(C) 2024 Prof. Tiran Dagan, FDU University. All rights reserved.
+-----------------------------------------------------------------
+
+Embedding Cache Module
+
+This module provides in-memory caches for the query path of the RAG
+pipeline, so repeated or near-identical questions skip remote calls.
+
+Key features:
+- Exact-match LRU cache of query embeddings, keyed by the normalized query
+- Semantic cache that reuses a stored result when a new query embedding is
+  close enough (cosine similarity) to a recent one, with a time-to-live
+"""
+
+import functools
+import re
+import time
+
+import numpy as np
+
+EXACT_CACHE_SIZE = 4096
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_SIMILARITY_THRESHOLD = 0.97
+SEMANTIC_CACHE_TTL = 300  # seconds
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_query(text):
+    """Lower-case a query and collapse whitespace so trivial variants share a cache entry."""
+    return _WHITESPACE_RE.sub(' ', text).strip().lower()
+
+class CachedEmbeddings:
+    """
+    Wraps an embeddings client and memoizes `embed_query` on the normalized text.
+
+    `embed_documents` is passed through unchanged.
+    """
+
+    def __init__(self, embeddings, maxsize=EXACT_CACHE_SIZE):
+        self.embeddings = embeddings
+        self._embed_normalized = functools.lru_cache(maxsize=maxsize)(self._embed)
+
+    def _embed(self, text):
+        # Stored as a tuple so cached vectors can't be mutated by callers
+        return tuple(self.embeddings.embed_query(text))
+
+    def embed_query(self, text):
+        return list(self._embed_normalized(normalize_query(text)))
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+class SemanticCache:
+    """
+    Fixed-size cache of values keyed by embedding vectors.
+
+    A lookup returns the value stored for the most similar vector if its cosine
+    similarity is at least `threshold` and the entry is younger than `ttl`
+    seconds. When full, the oldest entry is overwritten.
+    """
+
+    def __init__(self, max_entries=SEMANTIC_CACHE_SIZE,
+                 threshold=SEMANTIC_SIMILARITY_THRESHOLD, ttl=SEMANTIC_CACHE_TTL):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._vectors = None  # (max_entries, dim) array of unit vectors
+        self._values = []
+        self._timestamps = []
+        self._next = 0
+
+    @staticmethod
+    def _unit(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, vector):
+        """Return the cached value for the nearest stored vector, or None on a miss."""
+        if not self._values:
+            return None
+        scores = self._vectors[:len(self._values)] @ self._unit(vector)
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold and time.monotonic() - self._timestamps[best] <= self.ttl:
+            return self._values[best]
+        return None
+
+    def put(self, vector, value):
+        """Store `value` under `vector`, evicting the oldest entry when full."""
+        vector = self._unit(vector)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.size), dtype=np.float32)
+        self._vectors[self._next] = vector
+        if len(self._values) < self.max_entries:
+            self._values.append(value)
+            self._timestamps.append(time.monotonic())
+        else:
+            self._values[self._next] = value
+            self._timestamps[self._next] = time.monotonic()
+        self._next = (self._next + 1) % self.max_entries
@@ -9,120 +9,551 @@ This module provides functionality to enhance JSON data with LLM-generated
 summaries of images using OpenAI's GPT-4 Vision model.
 """
 
-from openai import OpenAI
+import asyncio
+import atexit
+import base64
+from collections import OrderedDict
+from contextlib import closing, nullcontext
+import hashlib
+import io
+import sqlite3
+import threading
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+from PIL import Image
 import json
 from .config import global_config
+from .file_and_folder import cache_json, discard_cached_json, read_json_cached, write_json
 import os
 import logging
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 
 console = Console()
 
-def enrich_json_with_summaries(json_file):
+# Event loop shared by all enrichment calls, run in a background thread, and
+# the OpenAI client bound to it; see _run_async and _get_client
+_loop = None
+_loop_lock = threading.Lock()
+_client = None
+
+# Content hash -> downscaled data URL, see _image_data_url
+_image_data_urls = OrderedDict()
+_image_data_urls_lock = threading.Lock()
+
+# Maximum number of OpenAI requests in flight at once
+ENRICHMENT_CONCURRENCY = 10
+
+# Element types whose text is summarized
+TEXT_ELEMENT_TYPES = frozenset(('NarrativeText', 'Title', 'UncategorizedText'))
+
+# Number of images sent together in a single summarization request
+IMAGE_BATCH_SIZE = 10
+
+# Images are downscaled to fit within this size before being sent for summarization
+IMAGE_MAX_SIZE = (768, 768)
+IMAGE_JPEG_QUALITY = 80
+
+# Downscaled data URLs kept for reuse when the same image is prepared again
+IMAGE_DATA_URL_CACHE_SIZE = 16
+
+# Retry policy for transient OpenAI failures (rate limits, timeouts, 5xx)
+OPENAI_MAX_ATTEMPTS = 5
+OPENAI_MAX_RETRY_WAIT = 30
+
+# Summaries are cached by content hash in this file inside the output directory
+SUMMARY_CACHE_FILE = '.summary_cache.db'
+
+_IMAGE_PROMPT = """You are an image summarizing agent. I will be giving you an image and you will provide a summary describing 
+    the image, starting with "An image", or "An illustration", or "A diagram:", or "A logo:" or "A symbol:". If it contains a part, 
+    you will try to identify the part and if it shows an action (such as a person cleaning 
+    a pool or a woman holding a pool cleaning product) you will call those out. If it is a symbol, just give the symbol
+    a meaningful name such as "warning symbol" or "attention!"
+    """
+
+_IMAGE_BATCH_PROMPT = _IMAGE_PROMPT + """
+    You will be given several images, each preceded by a label such as "Image 1:". Summarize every image
+    separately and respond with a JSON object of the form
+    {"summaries": [{"index": 1, "summary": "..."}, {"index": 2, "summary": "..."}]}
+    containing exactly one entry per image.
+    """
+
+_TEXT_PROMPT = """You are a text summarizing agent for product documentation. I will provide you with text. 
+                Begin with the relevant context, such as "A description of," "An explanation of," or 
+                "A guide to," based on the content type, and you will create a concise summary describing the 
+                text starting with:
+                1.	“Product Feature:” if it is a (e.g., battery life, cleaning efficiency) 
+                2.	“Usage Context” if it is a (e.g., recommended pool size) 
+                3.	“Appearance” if it highlights (e.g., color, visible components 
+                4.	“Port/Component Type” if it contains parts.
+                5.	“Battery/Charging:” if there is any information mentioning any unique attributes (e.g., “long-lasting battery,” “quick charging”).
+                6.	“Comparative Info:”  if text summarizes differences or advantages compared to competitors.
+                7.	“AI Features:” if mentioned in the text 
+                8.	“Eco-Friendly Attributes:” if text contains information about the environment
+                9.	“Customization Options:” if text contains information about customization
+                10.	“Warranty/Support:” if text has information focusing on service and reliability
+                11.	“Promotions/Seasonality:” if text has information or references timing or campaigns
+                12. "Warning:" if text contains a warning
+                13. "Product Name:" if text contains the product name
+                14. "Instructions:" if text contains instructions
+                15. "Safety:" if text contains safety information
+                16. "Parts:" if text contains information about parts
+                17. "Dimensions:" if text contains information about dimensions
+                18. "Certifications:" if text contains information about certifications
+                19. "Other:" if text contains other information
+
+    """
+
+def enrich_json_with_summaries(json_file, progress=None):
     """
     Processes JSON data, generating summaries for images and text that don't have them.
+
+    Images already marked `_enriched` and text elements that already have a
+    `summary` are skipped, so re-running on a partially enriched file resumes
+    where the previous run stopped.
+
+    Summaries are requested concurrently (bounded by ENRICHMENT_CONCURRENCY). The
+    enriched JSON is checkpointed after the image pass and written back once all
+    items have been processed; it is not rewritten if nothing changed.
     
     Args:
         json_file (str): Path to the JSON file being processed.
+        progress (Progress, optional): A live Rich progress display to report
+            to. Pass one when enriching several files concurrently, since
+            Rich allows only one live display at a time. By default a
+            transient display is created for this call.
     """
-    with open(json_file, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
+    _run_async(_enrich_json_with_summaries(json_file, progress))
 
-    # Retrieve lists of items to enrich
-    imageElements = [item for item in json_data if item['type'] == 'Image']
-    textElements = [item for item in json_data if item['type'] in ['NarrativeText', 'Title', 'UncategorizedText']]
-    
-    with Progress(
+def _run_async(coro):
+    """
+    Runs a coroutine on the shared enrichment event loop and waits for its result.
+
+    A single long-lived loop thread serves every caller thread, so the OpenAI
+    client (and its keep-alive connection pool) is reused across files and
+    worker threads, and nothing is left behind when a worker thread exits.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+def _get_loop():
+    """Returns the shared enrichment event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='enrichment-loop', daemon=True).start()
+            atexit.register(_shutdown_loop)
+        return _loop
+
+def _shutdown_loop():
+    """Closes the OpenAI client and stops the shared loop at interpreter exit."""
+    async def close_client():
+        if _client is not None:
+            await _client.close()
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_client(), _loop).result(timeout=10)
+    except Exception as e:
+        logging.warning(f"Could not close the OpenAI client: {str(e)}")
+    _loop.call_soon_threadsafe(_loop.stop)
+
+def _get_client():
+    """
+    Returns the shared AsyncOpenAI client, creating it on first use.
+
+    The client is bound to the shared enrichment loop, so coroutines using it
+    must run there (see _run_async).
+    """
+    global _client
+    if _client is None:
+        # Retries are handled by _openai_retry, so disable the SDK's own
+        _client = AsyncOpenAI(
+            api_key=global_config.api_keys.openai_api_key,
+            max_retries=0
+        )
+    return _client
+
+_backoff = wait_exponential_jitter(initial=1, max=OPENAI_MAX_RETRY_WAIT)
+
+def _wait_for_retry(retry_state):
+    """
+    Tenacity wait strategy that honors the server's Retry-After header when
+    present and otherwise falls back to exponential backoff with jitter.
+    """
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    if response is not None:
+        retry_after_ms = response.headers.get('retry-after-ms')
+        retry_after = response.headers.get('retry-after')
+        try:
+            if retry_after_ms is not None:
+                return min(float(retry_after_ms) / 1000, OPENAI_MAX_RETRY_WAIT)
+            if retry_after is not None:
+                return min(float(retry_after), OPENAI_MAX_RETRY_WAIT)
+        except ValueError:
+            pass
+    return _backoff(retry_state)
+
+def _log_retry(retry_state):
+    logging.warning(
+        f"OpenAI request failed ({retry_state.outcome.exception()}), "
+        f"retrying (attempt {retry_state.attempt_number}/{OPENAI_MAX_ATTEMPTS})"
+    )
+
+_openai_retry = retry(
+    stop=stop_after_attempt(OPENAI_MAX_ATTEMPTS),
+    wait=_wait_for_retry,
+    retry=retry_if_exception_type((RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)),
+    before_sleep=_log_retry,
+    reraise=True
+)
+
+async def _enrich_json_with_summaries(json_file, progress):
+    """Async driver for enrich_json_with_summaries."""
+    try:
+        await _enrich_cached_json(json_file, progress)
+    except BaseException:
+        # The cached data is modified in place and may now hold changes that
+        # were never written, so the next read must parse the file again
+        discard_cached_json(json_file)
+        raise
+
+async def _enrich_cached_json(json_file, progress):
+    """Enriches the (shared) cached data of a JSON file and saves it."""
+    # File I/O runs off the shared loop so other files' requests keep flowing
+    json_data = await asyncio.to_thread(read_json_cached, json_file)
+    updated = 0
+
+    # Retrieve lists of items to enrich in a single pass
+    imageElements, textElements = [], []
+    for item in json_data:
+        element_type = item['type']
+        if element_type == 'Image':
+            imageElements.append(item)
+        elif element_type in TEXT_ELEMENT_TYPES:
+            textElements.append(item)
+
+    sem = asyncio.Semaphore(ENRICHMENT_CONCURRENCY)
+    with closing(_open_summary_cache()) as cache:
+        with _progress_context(progress) as progress:
+
+            # Images: identical images (logos, symbols) are summarized only once
+            images_to_enrich = {}
+            for item in imageElements:
+                # Skip images summarized by a previous (possibly interrupted) run
+                if item.get('_enriched'):
+                    continue
+                image_base64 = item['metadata'].get('image_base64')
+                if image_base64:
+                    key = _summary_cache_key('image', image_base64)
+                    cached = _get_cached_summary(cache, key)
+                    if cached is not None:
+                        item['text'] = cached
+                        item['_enriched'] = True
+                        updated += 1
+                    else:
+                        images_to_enrich.setdefault(key, []).append(item)
+                else:
+                    console.print(f"Skipping image without base64 data: {item.get('text', 'Unnamed image')}", 
+                                style="yellow")
+
+            keys = list(images_to_enrich)
+            batches = [keys[i:i + IMAGE_BATCH_SIZE] for i in range(0, len(keys), IMAGE_BATCH_SIZE)]
+            batch_results = await _gather_with_progress(
+                progress,
+                f"Enriching image batches ({os.path.basename(json_file)})",
+                [_summarize_image_batch_async(
+                    sem, [_image_payload(images_to_enrich[key][0]) for key in batch])
+                 for batch in batches]
+            )
+
+            results = []
+            for batch, batch_result in zip(batches, batch_results):
+                if isinstance(batch_result, Exception):
+                    results.extend([batch_result] * len(batch))
+                else:
+                    results.extend(batch_result)
+
+            new_summaries = {}
+            for key, result in zip(keys, results):
+                if isinstance(result, Exception):
+                    console.print(f"Error processing image: {str(result)}", style="red")
+                    logging.error(f"Error processing image: {str(result)}")
+                else:
+                    for item in images_to_enrich[key]:
+                        item['text'] = result
+                        item['_enriched'] = True
+                        updated += 1
+                    new_summaries[key] = result
+            _cache_summaries(cache, new_summaries)
+
+            # Checkpoint image summaries before starting on text
+            if updated:
+                await asyncio.to_thread(_save_json, json_file, json_data)
+            images_updated = updated
+
+            # Text
+            texts_to_enrich = {}
+            for item in textElements:
+                if 'summary' in item:
+                    continue
+                text_content = item.get('text')
+                if text_content:
+                    key = _summary_cache_key('text', text_content)
+                    cached = _get_cached_summary(cache, key)
+                    if cached is not None:
+                        item['summary'] = cached
+                        updated += 1
+                    else:
+                        texts_to_enrich.setdefault(key, []).append(item)
+                else:
+                    console.print(f"Skipping empty text element", style="yellow")
+
+            keys = list(texts_to_enrich)
+            results = await _gather_with_progress(
+                progress,
+                f"Enriching text ({os.path.basename(json_file)})",
+                [_summarize_text_async(sem, texts_to_enrich[key][0]['text']) for key in keys]
+            )
+
+            new_summaries = {}
+            for key, result in zip(keys, results):
+                if isinstance(result, Exception):
+                    console.print(f"Error processing text: {str(result)}", style="red")
+                    logging.error(f"Error processing text: {str(result)}")
+                else:
+                    for item in texts_to_enrich[key]:
+                        item['summary'] = result
+                        updated += 1
+                    new_summaries[key] = result
+            _cache_summaries(cache, new_summaries)
+
+    # Leave the file (and its modification time) alone when nothing changed
+    if updated > images_updated:
+        await asyncio.to_thread(_save_json, json_file, json_data)
+
+    return
+
+def _open_summary_cache():
+    """
+    Opens (creating if needed) the SQLite summary cache in the output directory.
+
+    Returns:
+        sqlite3.Connection: Connection to the cache database.
+    """
+    cache_path = os.path.join(global_config.directories.output_dir, SUMMARY_CACHE_FILE)
+    # Concurrent enrichment runs share the cache, so wait for each other's writes
+    cache = sqlite3.connect(cache_path, timeout=30)
+    cache.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL)")
+    return cache
+
+def _summary_cache_key(kind, content):
+    """Builds the cache key for an image or text body from its SHA-256 digest."""
+    return f"{kind}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+
+def _get_cached_summary(cache, key):
+    """Returns the cached summary for `key`, or None on a miss."""
+    row = cache.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def _cache_summaries(cache, summaries):
+    """Stores newly generated summaries, keyed by content hash."""
+    if summaries:
+        with cache:
+            cache.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)",
+                summaries.items()
+            )
+
+def _save_json(json_file, json_data):
+    """
+    Writes the JSON data to a temporary file and atomically moves it into place,
+    so an interrupted run never leaves a truncated JSON file behind.
+    """
+    tmp_file = json_file + '.tmp'
+    write_json(tmp_file, json_data)
+    os.replace(tmp_file, json_file)
+    # Later reads of the file in this process reuse the data just written
+    cache_json(json_file, json_data)
+
+def _progress_context(progress):
+    """Returns a context for the caller's progress display, or a new transient one."""
+    if progress is not None:
+        return nullcontext(progress)
+    return Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True
-    ) as progress:
-        
-        # Images
-        task = progress.add_task(
-            f"Enriching images", 
-            total=len(imageElements)
-        )
+    )
+
+async def _gather_with_progress(progress, description, coros):
+    """
+    Runs coroutines concurrently, advancing a progress task as each one completes.
+
+    Args:
+        progress (Progress): The active Rich progress display.
+        description (str): Label for the progress task.
+        coros (list): Coroutines to run.
+
+    Returns:
+        list: Results in the order of `coros`; failed coroutines yield their exception.
+    """
+    total = len(coros)
+    task = progress.add_task(description, total=total)
+    completed = 0
+
+    async def track(coro):
+        nonlocal completed
+        try:
+            return await coro
+        finally:
+            completed += 1
+            progress.update(task, advance=1, description=f"{description}: {completed}/{total}")
+
+    try:
+        return await asyncio.gather(*(track(coro) for coro in coros), return_exceptions=True)
+    finally:
+        progress.remove_task(task)
+
+def _image_payload(item):
+    """Returns the (base64 data, MIME type) pair for an Image element."""
+    metadata = item['metadata']
+    return metadata['image_base64'], metadata.get('image_mime_type', 'image/jpeg')
+
+async def _summarize_image_async(sem, data_url):
+    """Summarizes a prepared image while holding a slot of the concurrency semaphore."""
+    async with sem:
+        return await _summarize_image_url(data_url)
 
-        for idx, item in enumerate(imageElements, 1):
-            progress.update(task, description=f"Enriching images: {idx}/{len(imageElements)}")
-            image_base64 = item['metadata'].get('image_base64')
-            if image_base64:
-                try:
-                    summary = summarize_image(image_base64)
-                    item['text'] = summary
-
-                    # Save after each image is processed
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-                    
-                    progress.advance(task)
-                except Exception as e:
-                    console.print(f"Error processing image: {str(e)}", style="red")
-                    logging.error(f"Error processing image: {str(e)}")
-            else:
-                console.print(f"Skipping image without base64 data: {item.get('text', 'Unnamed image')}", 
-                            style="yellow")
-
-        # Text
-        task = progress.add_task(
-            f"Enriching text", 
-            total=len(textElements)
+async def _image_data_urls_async(images):
+    """
+    Builds the data URLs for (base64 data, MIME type) pairs in worker threads,
+    so decoding and re-encoding images doesn't stall the shared event loop.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(_image_data_url, image_base64, mime) for image_base64, mime in images)
+    )
+
+async def _summarize_image_batch_async(sem, images):
+    """
+    Summarizes a batch of images in one request, falling back to one request
+    per image if the batched response cannot be parsed or the request is
+    rejected (e.g. because of a single bad image), so only that image fails.
+
+    Args:
+        sem (asyncio.Semaphore): Limits the number of requests in flight.
+        images (list): (base64 data, MIME type) pairs.
+
+    Returns:
+        list: One summary (or exception) per image, in input order.
+    """
+    # Images are prepared before taking a semaphore slot
+    data_urls = await _image_data_urls_async(images)
+    try:
+        async with sem:
+            return await _summarize_image_urls(data_urls)
+    except (BadRequestError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        logging.warning(f"Falling back to single-image summaries: {str(e)}")
+        return await asyncio.gather(
+            *(_summarize_image_async(sem, data_url) for data_url in data_urls),
+            return_exceptions=True
         )
 
-        for idx, item in enumerate(textElements, 1):
-            progress.update(task, description=f"Enriching text: {idx}/{len(textElements)}")
-            text_content = item.get('text')
-            if text_content:
-                try:
-                    summary = summarize_text(text_content)
-                    item['summary'] = summary
-
-                    # Save after each text element is processed
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-                    
-                    progress.advance(task)
-                except Exception as e:
-                    console.print(f"Error processing text: {str(e)}", style="red")
-                    logging.error(f"Error processing text: {str(e)}")
-            else:
-                console.print(f"Skipping empty text element", style="yellow")
+async def _summarize_text_async(sem, text_content):
+    """Summarizes text while holding a slot of the concurrency semaphore."""
+    async with sem:
+        return await summarize_text(text_content)
 
-    return
+def _image_data_url(image_base64, mime):
+    """
+    Builds the data URL sent to the model, downscaling the image to fit within
+    IMAGE_MAX_SIZE and re-encoding it as JPEG when it is larger than that.
+
+    Images that already fit, or that cannot be decoded, are sent unchanged with
+    their original MIME type. The last IMAGE_DATA_URL_CACHE_SIZE results are
+    cached by content hash so an image prepared again isn't transformed twice
+    (the original image data is not kept alive by the cache).
+
+    Args:
+        image_base64 (str): Base64-encoded image data.
+        mime (str): MIME type of the encoded image.
+
+    Returns:
+        str: A `data:` URL ready to send to the model.
+    """
+    key = (_summary_cache_key('image', image_base64), mime)
+    with _image_data_urls_lock:
+        data_url = _image_data_urls.get(key)
+        if data_url is not None:
+            _image_data_urls.move_to_end(key)
+            return data_url
+
+    data_url = _build_image_data_url(image_base64, mime)
+    with _image_data_urls_lock:
+        _image_data_urls[key] = data_url
+        if len(_image_data_urls) > IMAGE_DATA_URL_CACHE_SIZE:
+            _image_data_urls.popitem(last=False)
+    return data_url
 
-def summarize_image(image_base64):
+def _build_image_data_url(image_base64, mime):
+    """Downscales and encodes an image for _image_data_url (uncached)."""
+    try:
+        image = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+        if image.width <= IMAGE_MAX_SIZE[0] and image.height <= IMAGE_MAX_SIZE[1]:
+            return f"data:{mime};base64,{image_base64}"
+
+        image.thumbnail(IMAGE_MAX_SIZE)
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='JPEG', quality=IMAGE_JPEG_QUALITY)
+        return f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+    except Exception as e:
+        logging.warning(f"Could not downscale image, sending original: {str(e)}")
+        return f"data:{mime};base64,{image_base64}"
+
+async def summarize_image(image_base64, mime='image/jpeg'):
     """
     Generates a summary of an image using OpenAI's GPT-4 Vision model.
 
     Args:
         image_base64 (str): Base64-encoded image data.
+        mime (str): MIME type of the encoded image.
 
     Returns:
         str: A text summary of the image content.
     """
-    client = OpenAI(api_key=global_config.api_keys.openai_api_key)
-    
-    prompt = """You are an image summarizing agent. I will be giving you an image and you will provide a summary describing 
-    the image, starting with "An image", or "An illustration", or "A diagram:", or "A logo:" or "A symbol:". If it contains a part, 
-    you will try to identify the part and if it shows an action (such as a person cleaning 
-    a pool or a woman holding a pool cleaning product) you will call those out. If it is a symbol, just give the symbol
-    a meaningful name such as "warning symbol" or "attention!"
-    """
-    
-    response = client.chat.completions.create(
+    [data_url] = await _image_data_urls_async([(image_base64, mime)])
+    return await _summarize_image_url(data_url)
+
+@_openai_retry
+async def _summarize_image_url(data_url):
+    """Requests the summary of an image prepared by _image_data_url."""
+    response = await _get_client().chat.completions.create(
         model="gpt-4o",
         messages=[
+            {
+                "role": "system",
+                "content": _IMAGE_PROMPT
+            },
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": prompt},
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_base64}"
+                            "url": data_url,
+                            "detail": "low"
                         }
                     }
                 ]
@@ -133,9 +564,65 @@ def summarize_image(image_base64):
     
     return response.choices[0].message.content
 
-def summarize_text(text_content):
+async def summarize_images(images):
     """
-    Generates a summary of text content using OpenAI's GPT-4 model, 
+    Generates summaries for several images with a single GPT-4 Vision request.
+
+    Args:
+        images (list): (base64 data, MIME type) pairs, one per image.
+
+    Returns:
+        list: A text summary for each image, in input order.
+
+    Raises:
+        ValueError: If the response does not contain a summary for every image.
+    """
+    return await _summarize_image_urls(await _image_data_urls_async(images))
+
+@_openai_retry
+async def _summarize_image_urls(data_urls):
+    """Requests summaries for images prepared by _image_data_url, in one request."""
+    content = []
+    for index, data_url in enumerate(data_urls, 1):
+        content.append({"type": "text", "text": f"Image {index}:"})
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": data_url,
+                "detail": "low"
+            }
+        })
+
+    response = await _get_client().chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": _IMAGE_BATCH_PROMPT
+            },
+            {
+                "role": "user",
+                "content": content
+            }
+        ],
+        response_format={"type": "json_object"},
+        max_tokens=300 * len(data_urls)
+    )
+
+    summaries = {
+        int(entry["index"]): entry["summary"]
+        for entry in json.loads(response.choices[0].message.content)["summaries"]
+    }
+    missing = [index for index in range(1, len(data_urls) + 1) if index not in summaries]
+    if missing:
+        raise ValueError(f"Batch response is missing summaries for images {missing}")
+
+    return [summaries[index] for index in range(1, len(data_urls) + 1)]
+
+@_openai_retry
+async def summarize_text(text_content):
+    """
+    Generates a summary of text content using OpenAI's GPT-4o mini model, 
     focusing on product documentation features relevant to pool cleaning devices.
 
     Args:
@@ -144,40 +631,16 @@ def summarize_text(text_content):
     Returns:
         str: A summarized description of the text content with tags.
     """
-    client = OpenAI(api_key=global_config.api_keys.openai_api_key)
-    
-    prompt = """You are a text summarizing agent for product documentation. I will provide you with text. 
-                Begin with the relevant context, such as "A description of," "An explanation of," or 
-                "A guide to," based on the content type, and you will create a concise summary describing the 
-                text starting with:
-                1.	“Product Feature:” if it is a (e.g., battery life, cleaning efficiency) 
-                2.	“Usage Context” if it is a (e.g., recommended pool size) 
-                3.	“Appearance” if it highlights (e.g., color, visible components 
-                4.	“Port/Component Type” if it contains parts.
-                5.	“Battery/Charging:” if there is any information mentioning any unique attributes (e.g., “long-lasting battery,” “quick charging”).
-                6.	“Comparative Info:”  if text summarizes differences or advantages compared to competitors.
-                7.	“AI Features:” if mentioned in the text 
-                8.	“Eco-Friendly Attributes:” if text contains information about the environment
-                9.	“Customization Options:” if text contains information about customization
-                10.	“Warranty/Support:” if text has information focusing on service and reliability
-                11.	“Promotions/Seasonality:” if text has information or references timing or campaigns
-                12. "Warning:" if text contains a warning
-                13. "Product Name:" if text contains the product name
-                14. "Instructions:" if text contains instructions
-                15. "Safety:" if text contains safety information
-                16. "Parts:" if text contains information about parts
-                17. "Dimensions:" if text contains information about dimensions
-                18. "Certifications:" if text contains information about certifications
-                19. "Other:" if text contains other information
-
-    """
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
+    response = await _get_client().chat.completions.create(
+        model="gpt-4o-mini",
         messages=[
+            {
+                "role": "system",
+                "content": _TEXT_PROMPT
+            },
             {
                 "role": "user",
-                "content": prompt + "\n\nText: " + text_content
+                "content": "Text: " + text_content
             }
         ],
         max_tokens=300
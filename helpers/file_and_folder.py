@@ -1,9 +1,82 @@
+import functools
 import json
 import os
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Any, List, Union
 
 import fitz
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+def read_json(file_path: str) -> Any:
+    """Load a JSON file, using orjson when it is available."""
+    # Read raw bytes in one call; both parsers accept UTF-8 bytes directly,
+    # which skips the text-mode decoding layer
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Parsed JSON kept for read_json_cached: path -> (mtime_ns, size, data). Partition
+# JSON embeds base64 images, so only a few recent files are kept.
+JSON_CACHE_SIZE = 4
+_json_cache = OrderedDict()
+_json_cache_lock = threading.Lock()
+
+def read_json_cached(file_path: str) -> Any:
+    """
+    Load a JSON file, reusing the parsed data while the file is unchanged.
+
+    Entries are checked against the file's modification time and size, so a
+    file changed by someone else is parsed again. The returned object is
+    shared with other callers; it should only be modified if the file is then
+    rewritten and recorded with `cache_json`, or dropped with
+    `discard_cached_json` if that fails.
+    """
+    stat = os.stat(file_path)
+    with _json_cache_lock:
+        entry = _json_cache.get(file_path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            _json_cache.move_to_end(file_path)
+            return entry[2]
+
+    data = read_json(file_path)
+    _store_cached_json(file_path, stat, data)
+    return data
+
+def cache_json(file_path: str, data: Any) -> None:
+    """
+    Record `data` as the parsed contents of `file_path` as it is now on disk,
+    so that the next `read_json_cached` call doesn't parse the file just written.
+    """
+    _store_cached_json(file_path, os.stat(file_path), data)
+
+def discard_cached_json(file_path: str) -> None:
+    """Forget the cached data for `file_path`, e.g. after a failed rewrite."""
+    with _json_cache_lock:
+        _json_cache.pop(file_path, None)
+
+def _store_cached_json(file_path, stat, data):
+    with _json_cache_lock:
+        _json_cache[file_path] = (stat.st_mtime_ns, stat.st_size, data)
+        _json_cache.move_to_end(file_path)
+        while len(_json_cache) > JSON_CACHE_SIZE:
+            _json_cache.popitem(last=False)
+
+def write_json(file_path: str, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when it is available."""
+    if orjson is not None:
+        with open(file_path, 'wb') as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+
 def get_json_file_elements(pdf_filename):
     """
     Get the elements from the JSON file associated with a PDF.
@@ -15,19 +88,42 @@ def get_json_file_elements(pdf_filename):
         list: The JSON data elements.
     """
     file_path = pdf_filename +'.json'
-    with open(file_path, 'r') as file:
-        return json.load(file)
+    return read_json(file_path)
     
-def get_pdf_page_count(file_path: str) -> int:
-    """Get the number of pages in a PDF file."""
+@functools.lru_cache(maxsize=512)
+def _get_pdf_page_count(file_path: str, mtime_ns: int, size: int) -> int:
+    # fitz only parses the document trailer and page tree here, not the pages
     with fitz.open(file_path) as pdf:
         return len(pdf)
+
+def get_pdf_page_count(file_path: Union[str, os.PathLike]) -> int:
+    """
+    Get the number of pages in a PDF file (a path or an os.DirEntry).
+
+    Counts are cached until the file's modification time or size changes. For
+    a DirEntry the entry's own (cached) stat result is used, so repeated calls
+    with the same entry don't stat the file again.
+    """
+    if isinstance(file_path, os.DirEntry):
+        stat = file_path.stat()
+    else:
+        stat = os.stat(file_path)
+    return _get_pdf_page_count(os.fspath(file_path), stat.st_mtime_ns, stat.st_size)
     
+def scan_files_with_extension(directory: str, file_extension: str) -> List[os.DirEntry]:
+    """
+    Get the directory entries of the files in the specified directory.
+
+    File type information comes from the directory listing itself, so the
+    returned entries can be passed on without stat-ing each file again.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            entry
+            for entry in entries
+            if entry.name.endswith(file_extension) and entry.is_file()
+        ]
+
 def get_files_with_extension(directory: str, file_extension: str) -> List[str]:
     """Get list of files in the specified directory."""
-    file_list = [
-        os.path.join(directory, f) 
-        for f in os.listdir(directory) 
-        if f.endswith(file_extension)
-    ]
-    return file_list
+    return [entry.path for entry in scan_files_with_extension(directory, file_extension)]
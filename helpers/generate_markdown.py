@@ -10,86 +10,121 @@ into markdown format, preserving structure and content types.
 """
 
 import os
-import json
 import logging
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from .config import global_config
+from .file_and_folder import read_json
 
 PAGE_FOOTER = "\n\n---\nPage {current_page}\n\n---\n\n"
+ELEMENT_LABEL_TEMPLATE = "<div style='font-size: 10px; color: lightgrey; display: block;'>{category} | ID: {id}</div>\n\n"
+HEADER_TEMPLATE = "<div style='background-color: #f7facc;color: #000;padding: 12px 2px 4px; border-bottom: 1px solid #000;'> {content}\n\n</div>"
+FOOTER_TEMPLATE = "<div style='background-color: #f7facc;color: #000;padding: 12px 2px 4px; border-top: 1px solid #000;'> {content}\n\n</div>"
+SUMMARY_TEMPLATE = "<p style=\"line-height:.9; bgcolor: #000\"><span style=\"font-family:Tahoma; font-size:.7em; color: #24a8fb\">{summary}</span></p>"
 console = Console()
 
+def _format_title(orig_element, summary_html):
+    return f"> # {orig_element.get('text', 'No content')}\n\n"
+
+def _format_header(orig_element, summary_html):
+    return HEADER_TEMPLATE.format(content=orig_element.get('text', 'No content'))
+
+def _format_footer(orig_element, summary_html):
+    return FOOTER_TEMPLATE.format(content=orig_element.get('text', 'No content'))
+
+def _format_narrative(orig_element, summary_html):
+    return summary_html
+
+def _format_list_item(orig_element, summary_html):
+    return f"> - {orig_element.get('text', 'No content')}\n"
+
+def _format_image(orig_element, summary_html):
+    image_base64 = orig_element.get('image')
+    if image_base64:
+        # Determine the image format (assuming it's either PNG or JPEG)
+        image_format = 'png' if orig_element.get('image_mime_type') == 'image/png' else 'jpeg'
+        summary = SUMMARY_TEMPLATE.format(summary=orig_element['text'])
+        image_tag = f"![IMAGE:](data:image/{image_format};base64,{image_base64})"
+        return f"| {image_tag}  |\n|:--:|\n| {summary} |\n\n"
+    return f"> Image: {orig_element.get('text', 'No content') or '?Unknown'}\n\n"
+
+def _format_default(orig_element, summary_html):
+    return ""
+
+# Markdown formatter for each original element category
+ELEMENT_FORMATTERS = {
+    'Title': _format_title,
+    'Header': _format_header,
+    'Footer': _format_footer,
+    'NarrativeText': _format_narrative,
+    'UncategorizedText': _format_narrative,
+    'ListItem': _format_list_item,
+    'Table': _format_image,
+    'Image': _format_image,
+}
+
 def generate_markdown(json_data, visual=False):
     """
     Converts JSON data to Markdown format.
 
     Args:
-        json_data (list): A list of dictionaries containing structured content.
+        json_data (iterable): Dictionaries containing structured content. Both
+            the chunks and each chunk's 'orig_elements' may be generators;
+            they are consumed in a single pass.
 
     Returns:
         str: The formatted Markdown content.
     """
-    markdown_content = "\n"
+    md_parts = ["\n"]
     current_page = None
-    page_content = ""
+    page_parts = []
     
     for item in json_data:
         if 'orig_elements' not in item or item['orig_elements'] is None:
             console.print(f"Warning: Missing 'orig_elements' in item {item.get('id', 'unknown')}", style="yellow")
             continue
         
-        page_number = item['orig_elements'][0].get('page_number')
+        orig_elements = iter(item['orig_elements'])
+        first_element = next(orig_elements, None)
+        if first_element is None:
+            console.print(f"Warning: Empty 'orig_elements' in item {item.get('id', 'unknown')}", style="yellow")
+            continue
+        
+        page_number = first_element.get('page_number')
         
         if page_number != current_page and current_page is not None:
-            markdown_content += page_content
-            markdown_content += PAGE_FOOTER.format(current_page=current_page)
-            page_content = ""
+            md_parts.extend(page_parts)
+            md_parts.append(PAGE_FOOTER.format(current_page=current_page))
+            page_parts.clear()
         
         current_page = page_number
         chunk_text = " > " + "\n> ".join(item['text'].splitlines())
         chunk_id = item['id']
-        page_content += f"<details style='weight:bold'>\n<summary>Chunk {chunk_id}</summary>\n\n"
-        page_content += f"<details style='color: #583;weight:bold;padding-left: 1em;'>\n<summary>Chunk Text</summary>\n\n{chunk_text}\n\n</details>\n\n"
+        page_parts.append(f"<details style='weight:bold'>\n<summary>Chunk {chunk_id}</summary>\n\n")
+        page_parts.append(f"<details style='color: #583;weight:bold;padding-left: 1em;'>\n<summary>Chunk Text</summary>\n\n{chunk_text}\n\n</details>\n\n")
 
-        page_content += "<details style='color: #1010e0;weight:bold;padding-left: 1em;'>\n<summary>Original Elements</summary>\n\n"
+        page_parts.append("<details style='color: #1010e0;weight:bold;padding-left: 1em;'>\n<summary>Original Elements</summary>\n\n")
         
-        for orig_element in item['orig_elements']:
+        # The chunk summary is shared by all of its narrative elements, so build it once
+        summary_html = f"| {SUMMARY_TEMPLATE.format(summary=item['summary'])} |\n|:--:|\n\n" if 'summary' in item else ""
+        
+        for orig_element in chain((first_element,), orig_elements):
             category = orig_element.get('type', 'Unknown')
-            content = orig_element.get('text', 'No content')
             id = orig_element.get('id', 'No ID')
             
-            page_content += f"<div style='font-size: 10px; color: lightgrey; display: block;'>{category} | ID: {id}</div>\n\n"
-            if category == 'Title':
-                page_content += f"> # {content}\n\n"
-            elif category == 'Header':
-                page_content += f"<div style='background-color: #f7facc;color: #000;padding: 12px 2px 4px; border-bottom: 1px solid #000;'> {content}\n\n</div>"
-            elif category == 'Footer':
-                page_content += f"<div style='background-color: #f7facc;color: #000;padding: 12px 2px 4px; border-top: 1px solid #000;'> {content}\n\n</div>"
-            elif category in ['NarrativeText', 'UncategorizedText', 'Title']:
-                if 'summary' in item:
-                    summary = item['summary']
-                    page_content += f"| <p style=\"line-height:.9; bgcolor: #000\"><span style=\"font-family:Tahoma; font-size:.7em; color: #24a8fb\">{summary}</span></p> |\n|:--:|\n\n"
-            elif category == 'ListItem':
-                page_content += f"> - {content}\n"
-            elif category == 'Table' or category == 'Image':
-                image_base64 = orig_element.get('image')
-                if image_base64:
-                    # Determine the image format (assuming it's either PNG or JPEG)
-                    image_format = 'png' if orig_element.get('image_mime_type') == 'image/png' else 'jpeg'
-                    summary = f"<p style=\"line-height:.9; bgcolor: #000\"><span style=\"font-family:Tahoma; font-size:.7em; color: #24a8fb\">{orig_element['text']}</span></p>"
-                    image_tag = f"![IMAGE:](data:image/{image_format};base64,{image_base64})"
-                    page_content += f"| {image_tag}  |\n|:--:|\n| {summary} |\n\n"
-                else:
-                    page_content += f"> Image: {content or '?Unknown'}\n\n"
+            page_parts.append(ELEMENT_LABEL_TEMPLATE.format(category=category, id=id))
+            page_parts.append(ELEMENT_FORMATTERS.get(category, _format_default)(orig_element, summary_html))
         
-        page_content += "</details>\n\n</details>\n\n"
+        page_parts.append("</details>\n\n</details>\n\n")
     
     # Add the last page's content
-    if page_content:
-        markdown_content += page_content
-        markdown_content += PAGE_FOOTER.format(current_page=current_page)
+    if page_parts:
+        md_parts.extend(page_parts)
+        md_parts.append(PAGE_FOOTER.format(current_page=current_page))
     
-    return markdown_content
+    return "".join(md_parts)
 
 def create_debugging_markdown():
     """Process all markdown files in the output directory with chunking."""
@@ -101,76 +136,27 @@ def create_debugging_markdown():
         console.print("No chunked files to process", style="yellow")
         return
     
+    markdown_dir = os.path.join(output_dir, '04_markdown')
+    os.makedirs(markdown_dir, exist_ok=True)
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True
-    ) as progress:
+    ) as progress, ProcessPoolExecutor() as executor:
         task = progress.add_task("Processing chunked files", total=len(chunked_files))
         
-        for chunked_file in chunked_files:
+        futures = {
+            executor.submit(_create_debugging_markdown_file, os.path.join(chunked_dir, chunked_file), markdown_dir): chunked_file
+            for chunked_file in chunked_files
+        }
+        
+        for future in as_completed(futures):
+            chunked_file = futures[future]
             try:
-                progress.update(task, description=f"Processing {chunked_file}")
-                
-                # Full path to the markdown file
-                chunked_file_path = os.path.join(chunked_dir, chunked_file)
-                base_name = os.path.splitext(chunked_file)[0]
-                
-                with open(chunked_file_path, 'r') as file:
-                    chunks = json.load(file)
-
-                # Convert chunks to JSON-serializable format
-                chunks_data = []
-                for chunk in chunks:
-                    metadata = chunk["metadata"]
-                    chunk_id = chunk["element_id"]
-                    # Get and decode original elements if they exist
-                    orig_elements = None
-                    if "orig_elements" in metadata:
-                        orig_elements = process_data(metadata["orig_elements"])
-                        output_elements = []
-                        for orig_element in orig_elements:
-                            id = orig_element.id
-                            type = orig_element.category
-                            coordinates = orig_element.metadata.coordinates
-                            text = orig_element.text
-                            image = orig_element.metadata.image_base64
-                            image_mime_type = orig_element.metadata.image_mime_type
-                            page_number = orig_element.metadata.page_number
-                            output_dict = {"id": id,
-                                                    "type": type, 
-                                                    "coordinates": coordinates, 
-                                                    "text": text,
-                                                    "page_number": page_number}
-
-                            if type == "Image" or type == "Table":
-                                output_dict["image"] = image
-                                output_dict["image_mime_type"] = image_mime_type
-                            
-                            output_elements.append(output_dict)
-                    else:
-                        output_elements = None
-                    
-                    chunk_dict = {
-                        "id": chunk_id,
-                        "text": chunk['text'],
-                        "type": chunk['type'],
-                        "orig_elements": output_elements,
-                    }
-                       
-                    chunks_data.append(chunk_dict)
-                
-                # Generate the markdown file
-                markdown_dir = os.path.join(output_dir, '04_markdown')
-                os.makedirs(markdown_dir, exist_ok=True)
-                output_file = os.path.join(markdown_dir, f"{base_name}.md")
+                output_file = future.result()
                 
-                markdown_content = generate_markdown(chunks_data, visual=False)
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-                
-                progress.advance(task)
+                progress.update(task, advance=1, description=f"Processed {chunked_file}")
                 logging.info(f"Processed {chunked_file}")
                 console.print(f"Created: {os.path.basename(output_file)}", style="green")
                 
@@ -178,6 +164,77 @@ def create_debugging_markdown():
                 console.print(f"Error processing {chunked_file}: {str(e)}", style="red")
                 logging.error(f"Error processing {chunked_file}: {str(e)}")
 
+def _create_debugging_markdown_file(chunked_file_path, markdown_dir):
+    """
+    Converts a single chunked JSON file into a debugging markdown file.
+
+    Runs in a worker process, so it only relies on its arguments.
+
+    Args:
+        chunked_file_path (str): Path to the chunked JSON file.
+        markdown_dir (str): Directory the markdown file is written to.
+
+    Returns:
+        str: Path of the markdown file that was created.
+    """
+    base_name = os.path.splitext(os.path.basename(chunked_file_path))[0]
+    
+    chunks = read_json(chunked_file_path)
+    
+    # Generate the markdown file
+    output_file = os.path.join(markdown_dir, f"{base_name}.md")
+    
+    markdown_content = generate_markdown(_iter_chunks(chunks), visual=False)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(markdown_content)
+    
+    return output_file
+
+def _iter_chunks(chunks):
+    """
+    Yields chunks in the shape expected by generate_markdown.
+
+    Each chunk's original elements are decoded and yielded lazily, so neither
+    the chunk list nor the element lists are materialized.
+
+    Args:
+        chunks (list): Chunk elements loaded from a chunked JSON file.
+
+    Yields:
+        dict: The chunk id, text, type and a generator of its original elements.
+    """
+    for chunk in chunks:
+        metadata = chunk["metadata"]
+        # Get and decode original elements if they exist
+        if "orig_elements" in metadata:
+            output_elements = _iter_orig_elements(process_data(metadata["orig_elements"]))
+        else:
+            output_elements = None
+        
+        yield {
+            "id": chunk["element_id"],
+            "text": chunk['text'],
+            "type": chunk['type'],
+            "orig_elements": output_elements,
+        }
+
+def _iter_orig_elements(orig_elements):
+    """Yields a dictionary for each decoded original element of a chunk."""
+    for orig_element in orig_elements:
+        type = orig_element.category
+        output_dict = {"id": orig_element.id,
+                                "type": type, 
+                                "coordinates": orig_element.metadata.coordinates, 
+                                "text": orig_element.text,
+                                "page_number": orig_element.metadata.page_number}
+
+        if type == "Image" or type == "Table":
+            output_dict["image"] = orig_element.metadata.image_base64
+            output_dict["image_mime_type"] = orig_element.metadata.image_mime_type
+        
+        yield output_dict
+
 
 def create_markdowns():
     """
@@ -191,27 +248,26 @@ def create_markdowns():
     if not json_files:
         return
     
+    markdown_dir = os.path.join(output_dir, '03_markdown')
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True
-    ) as progress:
+    ) as progress, ProcessPoolExecutor() as executor:
         task = progress.add_task("Converting files to markdown", total=len(json_files))
         
-        for json_file in json_files:
+        futures = {
+            executor.submit(_create_markdown_file, json_file, markdown_dir): json_file
+            for json_file in json_files
+        }
+        
+        for future in as_completed(futures):
+            json_file = futures[future]
             try:
-                progress.update(task, description=f"Converting {os.path.basename(json_file)}")
+                markdown_file = future.result()
                 
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                markdown_content = json_to_markdown(json_data)
-                markdown_file = os.path.basename(os.path.splitext(json_file)[0] + '.md')
-                markdown_file_path = os.path.join(output_dir, '03_markdown', markdown_file)
-                with open(markdown_file_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-                
-                progress.advance(task)
+                progress.update(task, advance=1, description=f"Converted {os.path.basename(json_file)}")
                 logging.info(f"Created markdown file: {markdown_file}")
                 console.print(f"Created: {os.path.basename(markdown_file)}", style="green")
                 
@@ -219,6 +275,40 @@ def create_markdowns():
                 console.print(f"Error converting {os.path.basename(json_file)}: {str(e)}", style="red")
                 logging.error(f"Error converting {json_file}: {str(e)}")
 
+def _create_markdown_file(json_file, markdown_dir):
+    """
+    Converts a single partitioned JSON file into a markdown file.
+
+    Runs in a worker process, so it only relies on its arguments.
+
+    Args:
+        json_file (str): Path to the partitioned JSON file.
+        markdown_dir (str): Directory the markdown file is written to.
+
+    Returns:
+        str: Name of the markdown file that was created.
+    """
+    json_data = read_json(json_file)
+    
+    markdown_content = json_to_markdown(json_data)
+    markdown_file = os.path.basename(os.path.splitext(json_file)[0] + '.md')
+    markdown_file_path = os.path.join(markdown_dir, markdown_file)
+    with open(markdown_file_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_content)
+    
+    return markdown_file
+
 def process_data(data):
-    # Custom logic to process data
-    pass
+    """
+    Decodes the base64-encoded, gzipped original elements stored in a chunk's metadata.
+
+    Args:
+        data (str): The `orig_elements` value from a chunk's metadata.
+
+    Returns:
+        list: The original Unstructured elements of the chunk.
+    """
+    # Imported here so the module loads without unstructured>=0.13 installed
+    from unstructured.staging.base import elements_from_base64_gzipped_json
+    return elements_from_base64_gzipped_json(data)
+
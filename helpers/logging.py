@@ -1,12 +1,23 @@
 import logging
+from logging.handlers import MemoryHandler
+
+# Log records buffered in memory before being written to the log file
+LOG_BUFFER_CAPACITY = 1000
 
 def setup_logging():
     """Sets up logging for the application."""
+    # Records are buffered and written in bulk; an ERROR (or a full buffer, or
+    # interpreter exit) flushes the buffer so nothing is lost
+    file_handler = logging.FileHandler('pdf_converter.log', mode='w')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    buffered_handler = MemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
     logging.basicConfig(
-        filename='pdf_converter.log',
         level=logging.WARNING,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        filemode='w'
+        handlers=[buffered_handler]
     )
     # Suppress INFO logs from http.client
     console = logging.StreamHandler()
@@ -11,8 +11,9 @@ It processes PDFs to extract structured data and save it in a specified output d
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from .config import global_config
 from .pdf_annotation import annotate_pdf_pages
@@ -20,6 +21,7 @@ from .enrichments import enrich_json_with_summaries
 from .file_and_folder import get_files_with_extension, get_pdf_page_count
 
 from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn
 from unstructured_ingest.v2.pipeline.pipeline import Pipeline
 from unstructured_ingest.v2.interfaces import ProcessorConfig
 from unstructured_ingest.v2.processes.connectors.local import (LocalIndexerConfig,LocalDownloaderConfig,LocalConnectionConfig,LocalUploaderConfig)
@@ -27,6 +29,20 @@ from unstructured_ingest.v2.processes.partitioner import PartitionerConfig
 from unstructured_ingest.v2.processes.chunker import ChunkerConfig
 from unstructured_ingest.v2.logger import logger as unstructured_logger
 
+# Number of partition files enriched at the same time. Each file already keeps
+# up to ENRICHMENT_CONCURRENCY requests in flight, so keep this small.
+ENRICHMENT_MAX_WORKERS = 4
+
+# Bounds on split_pdf_concurrency_level; roughly one split request per 10 pages
+MIN_SPLIT_CONCURRENCY = 2
+MAX_SPLIT_CONCURRENCY = 15
+
+def use_local_gpu() -> bool:
+    """Whether PARTITIONING.USE_LOCAL_GPU is enabled in config.ini"""
+    partitioning = getattr(global_config, 'partitioning', None)
+    value = getattr(partitioning, 'use_local_gpu', 'False')
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
 @dataclass
 class PipelineConfigs:
     """Configuration container for Unstructured.io pipeline"""
@@ -58,30 +74,57 @@ class PDFProcessor:
         for directory in [self.work_dir, self.partitioned_dir, self.chunked_dir]:
             os.makedirs(directory, exist_ok=True)
 
-    def create_pipeline_configs(self, input_dir: str, output_dir: str, is_chunking: bool = False) -> PipelineConfigs:
+    def create_pipeline_configs(self, input_dir: str, output_dir: str, is_chunking: bool = False,
+                                total_pages: int = 0, num_files: int = 1) -> PipelineConfigs:
+        
+        """Create pipeline configurations for processing, sized to the input"""
+        local_gpu = use_local_gpu()
+        
+        # A single GPU is shared by all partitioning work, so don't fan out.
+        # Otherwise use at most one process per file; a single file avoids the
+        # cost of starting worker processes altogether.
+        if local_gpu:
+            num_processes = 1
+        else:
+            num_processes = min(os.cpu_count() or 1, max(1, num_files))
+        split_concurrency = max(MIN_SPLIT_CONCURRENCY, min(MAX_SPLIT_CONCURRENCY, total_pages // 10))
         
-        """Create pipeline configurations for processing"""
         processor_config = ProcessorConfig(
-            num_processes=3,
+            num_processes=num_processes,
             verbose=False,
             tqdm=True,
             work_dir=self.work_dir
         )
         
-        partitioner_config = PartitionerConfig(
-            partition_by_api=True,
-            strategy="hi_res",
-            api_key=global_config.api_keys.unstructured_api_key,
-            partition_endpoint=global_config.api_keys.unstructured_url,
-            extract_image_block_to_payload=True,
-            additional_partition_args={
-                "coordinates": True,
-                "extract_image_block_types": ["Image", "Table"],
-                "split_pdf_page": True,
-                "split_pdf_allow_failed": True,
-                "split_pdf_concurrency_level": 15
-            }
-        )
+        if local_gpu:
+            # Run the hi_res layout model locally (requires unstructured-inference
+            # and a CUDA build of torch) instead of calling the hosted API
+            partitioner_config = PartitionerConfig(
+                partition_by_api=False,
+                strategy="hi_res",
+                extract_image_block_to_payload=True,
+                additional_partition_args={
+                    "coordinates": True,
+                    "extract_image_block_types": ["Image", "Table"],
+                    "hi_res_model_name": "yolox",
+                    "device": "cuda"
+                }
+            )
+        else:
+            partitioner_config = PartitionerConfig(
+                partition_by_api=True,
+                strategy="hi_res",
+                api_key=global_config.api_keys.unstructured_api_key,
+                partition_endpoint=global_config.api_keys.unstructured_url,
+                extract_image_block_to_payload=True,
+                additional_partition_args={
+                    "coordinates": True,
+                    "extract_image_block_types": ["Image", "Table"],
+                    "split_pdf_page": True,
+                    "split_pdf_allow_failed": True,
+                    "split_pdf_concurrency_level": split_concurrency
+                }
+            )
         
         configs = PipelineConfigs(
             processor_config=processor_config,
@@ -104,13 +147,34 @@ class PDFProcessor:
             
         return configs
 
-    def process_pdfs(self, input_dir: str, pdf_files: List[str]):
-        """Main method to process PDF files"""
+    def process_pdfs(self, input_dir: str, pdf_files: List[Union[str, os.DirEntry]]):
+        """Main method to process PDF files (paths or entries from scan_files_with_extension)"""
         self.console.print(f"Processing {len(pdf_files)} PDF files...", style="blue")
         
+        # Entries from scan_files_with_extension carry their path and stat
+        # information; plain names are resolved against input_dir
+        pdf_files = [
+            pdf_file if isinstance(pdf_file, os.DirEntry)
+            else os.path.join(input_dir, os.path.basename(pdf_file))
+            for pdf_file in pdf_files
+        ]
+        
+        # Page counts size the pipelines; they are cached for annotation below
+        total_pages = 0
+        for pdf_file in pdf_files:
+            try:
+                total_pages += get_pdf_page_count(pdf_file)
+            except Exception as e:
+                logging.error(f"Could not count pages of {os.fspath(pdf_file)}: {str(e)}")
+        
         # 1. Run partitioning pipeline
         self.console.print("Starting partitioning...", style="blue")
-        configs = self.create_pipeline_configs(input_dir, self.partitioned_dir)
+        configs = self.create_pipeline_configs(
+            input_dir,
+            self.partitioned_dir,
+            total_pages=total_pages,
+            num_files=len(pdf_files)
+        )
         self._run_pipeline(configs)
         
         # 2. Enrich partitions
@@ -126,7 +190,9 @@ class PDFProcessor:
         chunking_configs = self.create_pipeline_configs(
             self.partitioned_dir, 
             self.chunked_dir, 
-            is_chunking=True
+            is_chunking=True,
+            total_pages=total_pages,
+            num_files=len(pdf_files)
         )
         self._run_pipeline(chunking_configs)
 
@@ -134,44 +200,58 @@ class PDFProcessor:
         
         # 4. Annotate PDF pages using coordinates found in partitioned JSON files
         for pdf_file in pdf_files:
-            basename = os.path.basename(pdf_file)
-            pdf_path = os.path.join(input_dir, basename)
+            pdf_path = os.fspath(pdf_file)
+            basename = os.path.basename(pdf_path)
             try:
-                num_pages = get_pdf_page_count(pdf_path)
+                num_pages = get_pdf_page_count(pdf_file)
                 annotate_pdf_pages(basename, num_pages)
             except FileNotFoundError:
                 self.console.print(f"Error: Could not find PDF file at {pdf_path}", style="red")
                 logging.error(f"PDF file not found: {pdf_path}")
             except Exception as e:
-                self.console.print(f"Error processing {pdf_file}: {str(e)}", style="red")
-                logging.error(f"Error processing {pdf_file}: {str(e)}")
+                self.console.print(f"Error processing {basename}: {str(e)}", style="red")
+                logging.error(f"Error processing {basename}: {str(e)}")
 
     def enrich_partitions(self):
         """Enhance partitionJSON metadata with summaries"""
         self.console.print("Enhancing image metadata...", style="blue")
         json_files = get_files_with_extension(self.partitioned_dir, '.json')
         
-        for json_file in json_files:
-            try:
-                enrich_json_with_summaries(json_file)
-            except Exception as e:
-                self.console.print(f"Error processing {json_file}: {str(e)}", style="red")
-                logging.error(f"Error processing {json_file}: {str(e)}")
+        # Enrichment is bound by API latency, so files are processed in threads.
+        # They share one progress display since Rich allows only one live display.
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+            transient=True
+        ) as progress, ThreadPoolExecutor(max_workers=ENRICHMENT_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(enrich_json_with_summaries, json_file, progress): json_file
+                for json_file in json_files
+            }
+            for future in as_completed(futures):
+                json_file = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self.console.print(f"Error processing {json_file}: {str(e)}", style="red")
+                    logging.error(f"Error processing {json_file}: {str(e)}")
 
     def cleanup_file_extensions(self):
         """Clean up duplicate .json extensions"""
-        chunked_files = [
-            f for f in os.listdir(self.chunked_dir) 
-            if f.endswith('.json.json')
-        ]
+        # The chunker re-appends .json to the already .json partition files
+        with os.scandir(self.chunked_dir) as entries:
+            renames = [
+                (entry.path, entry.path[:-len('.json')])
+                for entry in entries
+                if entry.name.endswith('.json.json')
+            ]
         
-        for file in chunked_files:
-            old_path = os.path.join(self.chunked_dir, file)
-            new_path = os.path.join(self.chunked_dir, file.replace('.json.json', '.json'))
-            os.rename(old_path, new_path)
+        for old_path, new_path in renames:
+            os.replace(old_path, new_path)
             
         self.console.print(
-            f"Renamed {len(chunked_files)} files to remove duplicate .json extension", 
+            f"Renamed {len(renames)} files to remove duplicate .json extension", 
             style="green"
         )
 
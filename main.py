@@ -45,7 +45,7 @@ def main():
         if task == "Ingest PDFs and create JSON & Annotations":
             input_dir = global_config.directories.input_dir
             processor = PDFProcessor()
-            pdf_files = get_files_with_extension(input_dir, '.pdf')
+            pdf_files = scan_files_with_extension(input_dir, '.pdf')
             processor.process_pdfs(input_dir, pdf_files)
             
         elif task == "Create Debugging Markdowns from partition JSONs":
@@ -1,24 +1,44 @@
 import argparse
+import asyncio
+import functools
+import logging
 import os
+import queue
+import threading
 from dotenv import load_dotenv
-from langchain_community.document_loaders import PyPDFDirectoryLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from supabase_client_module.supabase_config import get_supabase_client
 from langchain_community.vectorstores import SupabaseVectorStore
 from langchain_community.embeddings import OpenAIEmbeddings  # Updated import
 
+import httpx
+from pypdf import PdfReader
+from postgrest.exceptions import APIError
+try:
+    import psycopg
+except ImportError:  # psycopg is optional; embeddings are stored through PostgREST without it
+    psycopg = None
+from tenacity import (
+    retry,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 import uuid
+from collections import Counter
+from itertools import islice
+from pathlib import Path
 from datetime import datetime
 import re
+from helpers.config import global_config, load_config
 from helpers.enrichments import enrich_json_with_summaries
 from pdf2image import convert_from_path
 import io
-import gc
-import time
 from tqdm import tqdm
+from rich.progress import Progress
 from PIL import Image
-import traceback
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,13 +47,75 @@ load_dotenv()
 supabase_url = os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("SUPABASE_KEY")
 
+logger = logging.getLogger(__name__)
+
 DATA_PATH = "data"
 BATCH_SIZE = 3  # Process 3 documents at a time
+MAX_CONCURRENT_REQUESTS = 20  # Supabase/OpenAI requests in flight at once
+PREFETCH_BATCHES = 2  # Batches loaded ahead while the current one is stored
+
+# PostgREST error codes for a database that is unreachable or overloaded
+_TRANSIENT_PGRST_CODES = frozenset(('PGRST000', 'PGRST001', 'PGRST002', 'PGRST003'))
+
+def _is_transient_api_error(e):
+    """
+    Whether `e` is a postgrest APIError for a rate limit or server-side failure.
+
+    postgrest raises APIError for every non-2xx response. Non-JSON responses
+    (e.g. from the gateway) carry the 3-digit HTTP status as their code;
+    database errors carry a 5-character SQLSTATE, which is never retried.
+    """
+    if not isinstance(e, APIError):
+        return False
+    code = str(e.code or '')
+    if len(code) == 3 and code.isdigit():
+        status = int(code)
+        return status == 429 or status >= 500
+    return code in _TRANSIENT_PGRST_CODES
+
+# Upserts are idempotent, so rate limits, 5xx responses and any transport
+# failure are retried with jittered exponential backoff
+_db_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=0.2, max=5),
+    retry=retry_if_exception(_is_transient_api_error) | retry_if_exception_type(httpx.TransportError),
+    reraise=True
+)
+
+# Plain inserts may already have been committed when a response is lost, so
+# they are only retried if the request never reached the server
+_db_connect_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=0.2, max=5),
+    retry=retry_if_exception_type((httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)),
+    reraise=True
+)
+
+# Patterns used to extract product information from the first page
+_PIECES_RE = re.compile(r'([A-Z])\s*$')
+_CORDLESS_VACUUM_RE = re.compile(r'cordless\s+vacuum', re.IGNORECASE)
+_MODEL_RE = re.compile(r'(?:volt\s+)?fx-\d+li', re.IGNORECASE)
+
+# Keywords are words of at least 3 characters that start with a letter
+_WORD_RE = re.compile(r"[a-z][a-z0-9\-]{2,}")
+_STOPWORDS = frozenset("""
+    about above after again against all also among and any are aren because been before being below
+    between both but can cannot could did didn does doesn doing don down during each either else
+    etc even ever every few for from further get gets had hadn has hasn have haven having her here
+    hers herself him himself his how however into isn its itself just least less let like made make
+    many may might mine more most much must mustn near need neither never nor not now off often once
+    one only other ought our ours ourselves out over own per please rather same shall shan she should
+    shouldn since some such than that the their theirs them themselves then there these they this
+    those though through thus too under until upon use used using very via was wasn way well were
+    weren what when where whether which while who whom whose why will with within without won would
+    wouldn yes yet you your yours yourself yourselves
+""".split())
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--reset", action="store_true", help="Reset the database.")
     args = parser.parse_args()
+    load_config()
     
     try:
         if args.reset:
@@ -47,70 +129,192 @@ def main():
         print(f"An error occurred during processing: {str(e)}")
 
 def load_documents():
-    document_loader = PyPDFDirectoryLoader(DATA_PATH)
-    documents = document_loader.load()
-    
-    unique_documents = {}
-    for doc in documents:
-        pdf_path = doc.metadata['source']
-        if pdf_path not in unique_documents:
-            unique_documents[pdf_path] = doc
-            print(f"Loading document: {pdf_path}")
-    
-    return list(unique_documents.values())
+    """
+    Lazily yields one document per PDF under DATA_PATH.
+
+    Only the first page of each PDF is used downstream, so only that page's
+    text is extracted; pypdf loads page objects on demand, so the remaining
+    pages are never parsed. Hidden files and directories are skipped, as
+    PyPDFDirectoryLoader does, and the metadata matches PyPDFLoader's.
+
+    Yields:
+        Document: The first page of each PDF.
+    """
+    data_path = Path(DATA_PATH)
+    for pdf_path in data_path.glob("**/[!.]*.pdf"):
+        if not pdf_path.is_file() or any(part.startswith('.') for part in pdf_path.relative_to(data_path).parts):
+            continue
+        reader = PdfReader(str(pdf_path))
+        if not reader.pages:
+            continue
+        logger.debug("Loading document: %s", pdf_path)
+        yield Document(
+            page_content=reader.pages[0].extract_text(),
+            metadata={'source': str(pdf_path), 'page': 0}
+        )
+
+def iter_batches(documents, batch_size=BATCH_SIZE):
+    """Yields lists of up to `batch_size` documents."""
+    documents = iter(documents)
+    while True:
+        batch = list(islice(documents, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def prefetch(iterable, max_ahead=PREFETCH_BATCHES):
+    """
+    Iterates over `iterable` in a background thread, keeping up to `max_ahead`
+    items ready. Exceptions raised by the producer are re-raised to the caller.
+    """
+    items = queue.Queue(maxsize=max_ahead)
+    done = object()
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put((item, None))
+        except Exception as e:
+            items.put((done, e))
+        else:
+            items.put((done, None))
+
+    # Daemon so that a consumer that stops early doesn't block interpreter exit
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item, error = items.get()
+        if item is done:
+            if error is not None:
+                raise error
+            return
+        yield item
 
 def process_documents_in_batches(documents):
-    total_documents = len(documents)
-    for i in range(0, total_documents, BATCH_SIZE):
-        batch = documents[i:i+BATCH_SIZE]
-        print(f"Processing batch {i//BATCH_SIZE + 1}/{(total_documents + BATCH_SIZE - 1)//BATCH_SIZE}")
+    """
+    Processes an iterable of documents in batches of BATCH_SIZE.
+
+    PDF parsing is CPU-bound and storing a batch is I/O-bound, so the next
+    batches are loaded in a background thread while the current one is stored.
+    """
+    for batch_number, batch in enumerate(prefetch(iter_batches(documents)), start=1):
+        logger.debug("Processing batch %d", batch_number)
         process_documents(batch)
-        gc.collect()
-        time.sleep(1)  # Short pause between batches
 
 def process_documents(documents):
+    """Processes a batch of documents concurrently."""
+    asyncio.run(_process_documents(documents))
+
+async def _process_documents(documents):
     supabase_client = get_supabase_client()
     embedding_function = get_embedding_function()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # Documents are enriched concurrently and Rich allows only one live display,
+    # so they share a disabled progress display; the tqdm bar reports progress
+    enrichment_progress = Progress(disable=True)
 
-    for doc in tqdm(documents, desc="Processing documents"):
-        try:
-            process_single_document(supabase_client, embedding_function, doc)
-        except Exception as e:
-            print(f"Error processing document {doc.metadata['source']}: {str(e)}")
+    # Embeddings of the whole batch are written together once all documents are done
+    embedding_rows = []
+
+    with tqdm(total=len(documents), desc="Processing documents") as progress_bar:
+        async def process(doc):
+            try:
+                embedding_rows.extend(
+                    await process_single_document(supabase_client, embedding_function, doc, sem,
+                                                  enrichment_progress)
+                )
+            except Exception as e:
+                logger.error("Error processing document %s: %s", doc.metadata['source'], e)
+            finally:
+                progress_bar.update(1)
+
+        await asyncio.gather(*(process(doc) for doc in documents))
+
+    # A failed write loses this batch's embeddings only; later batches still run
+    try:
+        await asyncio.to_thread(store_embeddings, supabase_client, embedding_rows)
+    except Exception as e:
+        logger.error("Error storing embeddings for %d sections: %s", len(embedding_rows), e)
+
+async def _run_blocking(sem, func, *args):
+    """Runs a blocking Supabase/OpenAI call in a worker thread, bounded by `sem`."""
+    async with sem:
+        return await asyncio.to_thread(func, *args)
 
-def process_single_document(supabase_client, embedding_function, doc):
+async def process_single_document(supabase_client, embedding_function, doc, sem, progress=None):
+    """
+    Stores a document, its sections and keywords, and computes the section embeddings.
+
+    Independent requests run concurrently: the embeddings request overlaps
+    the product/document/section inserts, followed by the keyword insert.
+    `progress` is passed on to enrich_json_with_summaries.
+
+    Returns:
+        list: (section_id, embedding, tokens_count) rows for `store_embeddings`.
+    """
     try:
         product_info = extract_product_info(doc)
-        product_id = insert_product(supabase_client, product_info)
-        document_id = insert_document(supabase_client, doc, product_id)
-        
         sections = split_into_sections(doc)
-        for i, section in enumerate(sections):
-            section_id = insert_section(supabase_client, section, document_id, i+1)
-            keywords = extract_keywords(section.page_content)
-            insert_keywords(supabase_client, keywords, section_id)
-            embedding = embedding_function.embed_query(section.page_content)
-            insert_embedding(supabase_client, embedding, section_id, len(section.page_content.split()))
-
-        # Process images in the document
-        json_file = doc.metadata['source']
-        enrich_json_with_summaries(json_file)
+        contents = [section.page_content for section in sections]
+
+        async def insert_document_and_sections():
+            product_id = await _run_blocking(sem, insert_product, supabase_client, product_info)
+            document_id = await _run_blocking(sem, insert_document, supabase_client, doc, product_id)
+            if not sections:
+                return []
+            return await _run_blocking(sem, insert_sections, supabase_client, sections, document_id)
+
+        if sections:
+            # One batched embeddings request and one bulk insert per table
+            embeddings, section_ids = await asyncio.gather(
+                _run_blocking(sem, embedding_function.embed_documents, contents),
+                insert_document_and_sections()
+            )
+            await _run_blocking(sem, insert_keywords, supabase_client, [
+                (section_id, extract_keywords(content))
+                for section_id, content in zip(section_ids, contents)
+            ])
+            embedding_rows = [
+                (section_id, embedding, len(content.split()))
+                for section_id, embedding, content in zip(section_ids, embeddings, contents)
+            ]
+        else:
+            await insert_document_and_sections()
+            embedding_rows = []
     except Exception as e:
-        print(f"Error processing document {doc.metadata['source']}: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error processing document %s: %s", doc.metadata['source'], e)
+        return []
+
+    # Enrich the document's partition JSON, if it has been ingested. Elements
+    # already enriched during ingestion are skipped, and when nothing is left
+    # to do the file is not rewritten; a file recently enriched in this process
+    # is reused from memory rather than parsed again. The document is already
+    # stored at this point, so a failure here must not drop its embeddings.
+    json_file = get_partitioned_json_path(doc.metadata['source'])
+    if os.path.exists(json_file):
+        try:
+            await asyncio.to_thread(enrich_json_with_summaries, json_file, progress)
+        except Exception as e:
+            logger.error("Error enriching %s: %s", json_file, e)
+    return embedding_rows
+
+def get_partitioned_json_path(pdf_path):
+    """Returns the path of the partition JSON written for a PDF during ingestion."""
+    partitioned_dir = os.path.join(os.path.realpath(global_config.directories.output_dir), '01_partitioned')
+    return os.path.join(partitioned_dir, os.path.basename(pdf_path) + '.json')
 
 def extract_product_info(doc):
     filename = os.path.basename(doc.metadata['source'])
-    product_name = filename.split('.')[0]
-    content = doc.page_content.lower()
+    product_name = filename.partition('.')[0]
+    content = doc.page_content
+    first_line = content.partition('\n')[0]
     
-    pieces_match = re.search(r'([A-Z])\s*$', content.split('\n')[0])
+    pieces_match = _PIECES_RE.search(first_line)
     num_pieces = ord(pieces_match.group(1)) - ord('A') + 1 if pieces_match else None
     
-    if "cordless vacuum" in content:
-        model_match = re.search(r'(volt\s+fx-\d+li|fx-\d+li)', content, re.IGNORECASE)
+    if _CORDLESS_VACUUM_RE.search(content):
+        model_match = _MODEL_RE.search(content)
         if model_match:
-            product_name = f"Cordless Vacuum {model_match.group(1).upper()}"
+            product_name = f"Cordless Vacuum {model_match.group(0).upper()}"
         else:
             product_name = "Cordless Vacuum " + product_name
     
@@ -125,23 +329,30 @@ def extract_product_info(doc):
         'num_pieces': num_pieces
     }
 
+@_db_retry
 def insert_product(supabase_client, product_info):
+    """
+    Inserts a product, or updates the existing one with the same name, in a
+    single request. Requires a UNIQUE constraint on products.product_name.
+
+    Returns:
+        int: The product id.
+    """
     product_info_copy = product_info.copy()
     product_info_copy.pop('num_pieces', None)
     
-    for _ in range(3):
-        try:
-            existing_product = supabase_client.table('products').select('product_id').eq('product_name', product_info_copy['product_name']).execute()
-            if existing_product.data:
-                return existing_product.data[0]['product_id']
-            response = supabase_client.table('products').insert(product_info_copy).execute()
-            return response.data[0]['product_id']
-        except Exception as e:
-            print(f"Error inserting product, retrying: {str(e)}")
-            time.sleep(1)
-    raise Exception("Failed to insert product after 3 attempts")
+    response = supabase_client.table('products').upsert(product_info_copy, on_conflict='product_name').execute()
+    return response.data[0]['product_id']
 
+@_db_retry
 def insert_document(supabase_client, doc, product_id):
+    """
+    Inserts a document, or updates the existing one with the same file path,
+    in a single request. Requires a UNIQUE constraint on documents.file_path.
+
+    Returns:
+        int: The document id.
+    """
     document_info = {
         'title': os.path.basename(doc.metadata['source']),
         'product_name': doc.metadata['product_name'],
@@ -152,11 +363,7 @@ def insert_document(supabase_client, doc, product_id):
         'num_pieces': doc.metadata.get('num_pieces')
     }
     
-    existing_document = supabase_client.table('documents').select('document_id').eq('file_path', document_info['file_path']).execute()
-    if existing_document.data:
-        return existing_document.data[0]['document_id']
-    
-    response = supabase_client.table('documents').insert(document_info).execute()
+    response = supabase_client.table('documents').upsert(document_info, on_conflict='file_path').execute()
     return response.data[0]['document_id']
 
 def split_into_sections(doc):
@@ -168,32 +375,110 @@ def split_into_sections(doc):
     )
     return text_splitter.split_documents([doc])
 
-def insert_section(supabase_client, section, document_id, order):
-    section_info = {
-        'document_id': document_id,
-        'section_title': f"Section {order}",
-        'content': section.page_content,
-        'page_number': section.metadata.get('page', 1),
-        'order': order
-    }
-    response = supabase_client.table('sections').insert(section_info).execute()
-    return response.data[0]['section_id']
+@_db_connect_retry
+def insert_sections(supabase_client, sections, document_id):
+    """
+    Inserts all sections of a document in a single request.
+
+    Returns:
+        List[int]: The section ids, in the same order as `sections`.
+    """
+    section_data = [
+        {
+            'document_id': document_id,
+            'section_title': f"Section {order}",
+            'content': section.page_content,
+            'page_number': section.metadata.get('page', 1),
+            'order': order
+        }
+        for order, section in enumerate(sections, 1)
+    ]
+    response = supabase_client.table('sections').insert(section_data).execute()
+    section_ids = {row['order']: row['section_id'] for row in response.data}
+    return [section_ids[order] for order in range(1, len(sections) + 1)]
 
 def extract_keywords(text):
-    words = re.findall(r'\b\w+\b', text.lower())
-    return list(set(words))
-
-def insert_keywords(supabase_client, keywords, section_id):
-    keyword_data = [{'section_id': section_id, 'keyword': kw, 'importance_score': 1.0} for kw in keywords]
-    supabase_client.table('keywords').insert(keyword_data).execute()
-
-def insert_embedding(supabase_client, embedding, section_id, tokens_count):
-    embedding_data = {
-        'section_id': section_id,
-        'embedding': embedding,
-        'tokens_count': tokens_count
-    }
-    supabase_client.table('indexing_metadata').insert(embedding_data).execute()
+    """
+    Extracts keywords from text, scored by term frequency.
+
+    Stopwords, numbers and words shorter than three characters are dropped.
+
+    Returns:
+        Dict[str, float]: Each keyword mapped to its share of all keyword occurrences.
+    """
+    counts = Counter(w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS)
+    total = sum(counts.values())
+    return {kw: count / total for kw, count in counts.items()}
+
+@_db_connect_retry
+def insert_keywords(supabase_client, section_keywords):
+    """
+    Inserts the keywords of several sections in a single request.
+
+    Args:
+        section_keywords: Iterable of (section_id, keywords) pairs, where
+            keywords maps each keyword to its importance score.
+    """
+    keyword_data = [
+        {'section_id': section_id, 'keyword': kw, 'importance_score': score}
+        for section_id, keywords in section_keywords
+        for kw, score in keywords.items()
+    ]
+    if keyword_data:
+        supabase_client.table('keywords').insert(keyword_data).execute()
+
+@_db_connect_retry
+def insert_embeddings(supabase_client, section_embeddings):
+    """
+    Inserts the embeddings of several sections in a single request.
+
+    Args:
+        section_embeddings: Iterable of (section_id, embedding, tokens_count) tuples.
+    """
+    embedding_data = [
+        {
+            'section_id': section_id,
+            'embedding': embedding,
+            'tokens_count': tokens_count
+        }
+        for section_id, embedding, tokens_count in section_embeddings
+    ]
+    if embedding_data:
+        supabase_client.table('indexing_metadata').insert(embedding_data).execute()
+
+def store_embeddings(supabase_client, section_embeddings):
+    """
+    Stores section embeddings in the indexing_metadata table.
+
+    When SUPABASE_DB_URL is set and psycopg is installed, the rows are streamed
+    straight into Postgres with COPY. Otherwise, or if COPY fails, they are sent
+    as a single PostgREST bulk insert.
+
+    Args:
+        section_embeddings: (section_id, embedding, tokens_count) tuples.
+    """
+    if not section_embeddings:
+        return
+    db_url = os.getenv("SUPABASE_DB_URL")
+    if db_url and psycopg is not None:
+        try:
+            copy_embeddings(db_url, section_embeddings)
+            return
+        except Exception as e:
+            logger.warning("COPY into indexing_metadata failed, falling back to insert: %s", e)
+    insert_embeddings(supabase_client, section_embeddings)
+
+def copy_embeddings(db_url, section_embeddings):
+    """
+    Streams embeddings into indexing_metadata with COPY.
+
+    Vectors are sent in pgvector's text format ('[x1,x2,...]').
+    """
+    with psycopg.connect(db_url) as connection:
+        with connection.cursor() as cursor:
+            with cursor.copy("COPY indexing_metadata (section_id, embedding, tokens_count) FROM STDIN") as copy:
+                for section_id, embedding, tokens_count in section_embeddings:
+                    copy.write_row((section_id, '[' + ','.join(map(str, embedding)) + ']', tokens_count))
 
 def insert_image_info(supabase_client, document_id, image_info, image_number):
     image_data = {
@@ -206,11 +491,31 @@ def insert_image_info(supabase_client, document_id, image_info, image_number):
         result = supabase_client.table('product_images').insert(image_data).execute()
         return result
     except Exception as e:
-        print(f"Error inserting image info: {str(e)}")
+        logger.error("Error inserting image info: %s", e)
         return None
 
 def clear_database():
+    """
+    Removes all rows from the pipeline tables.
+
+    Uses the `truncate_all` database function when it exists:
+
+        CREATE FUNCTION truncate_all() RETURNS void AS $$
+            TRUNCATE indexing_metadata, keywords, sections, product_images,
+                     documents, products RESTART IDENTITY CASCADE;
+        $$ LANGUAGE sql;
+
+    Otherwise each table is emptied with a single unfiltered DELETE.
+    """
     supabase_client = get_supabase_client()
+    try:
+        supabase_client.rpc('truncate_all', {}).execute()
+        logger.debug("Database cleared successfully")
+        return
+    except APIError as e:
+        # Most likely the function has not been created in this database
+        logger.warning("truncate_all failed, deleting table by table: %s", e)
+
     tables = [
         'indexing_metadata',
         'keywords',
@@ -221,37 +526,23 @@ def clear_database():
     ]
     for table in tables:
         try:
-            response = supabase_client.table(table).select('id').execute()
-            ids = [item['id'] for item in response.data]
-            batch_size = 100
-            for i in range(0, len(ids), batch_size):
-                batch = ids[i:i+batch_size]
-                supabase_client.table(table).delete().in_('id', batch).execute()
-            print(f"Cleared table: {table}")
+            # PostgREST requires a filter on DELETE; this one matches every row
+            supabase_client.table(table).delete().not_.is_('id', 'null').execute()
+            logger.debug("Cleared table: %s", table)
         except Exception as e:
-            print(f"Error clearing table {table}: {str(e)}")
+            logger.error("Error clearing table %s: %s", table, e)
     
-    print("Database cleared successfully")  # Confirmation of successful database clear
+    logger.debug("Database cleared successfully")
 
 # Embedding function definition
+@functools.lru_cache(maxsize=1)
 def get_embedding_function():
     """
-    Returns an embedding function that can embed text queries.
+    Returns the shared embeddings client, creating it on first use.
+
+    Use `embed_query(text)` for a single text and `embed_documents(texts)` to
+    embed many texts in batched requests.
     """
-    embeddings = OpenAIEmbeddings()  # Initialize with necessary API key or configurations
-
-    def embed_query(text):
-        """
-        Generates an embedding for the given text.
-        
-        Args:
-            text (str): The text to embed.
-        
-        Returns:
-            List[float]: The embedding vector for the text.
-        """
-        return embeddings.embed_query(text)
-
-    return embed_query
+    return OpenAIEmbeddings()  # Initialize with necessary API key or configurations
 
 
@@ -1,5 +1,9 @@
 import argparse
+import copy
+import functools
+import logging
 import os
+import re
 from dotenv import load_dotenv
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
@@ -7,6 +11,7 @@ from langchain_community.vectorstores import SupabaseVectorStore
 from langchain.schema import Document
 
 from supabase_client_module.populate_database import get_embedding_function
+from helpers.embedding_cache import CachedEmbeddings, SemanticCache
 
 from supabase_client_module.supabase_config import get_supabase_client
 
@@ -19,10 +24,52 @@ load_dotenv()
 supabase_url = os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("SUPABASE_KEY")
 
+logger = logging.getLogger(__name__)
+
 # ANSI escape codes for colors
 LIGHT_BLUE = "\033[94m"
 RESET_COLOR = "\033[0m"
 
+# Colors recognised in queries; matched against the keys of product_images.colors
+COLOR_PALETTE = (
+    'black', 'white', 'gray', 'grey', 'silver', 'red', 'orange', 'yellow',
+    'green', 'blue', 'purple', 'pink', 'brown', 'beige', 'gold',
+)
+_COLOR_RE = re.compile(r'\b(' + '|'.join(COLOR_PALETTE) + r')\b', re.IGNORECASE)
+
+# Query embeddings are memoized by query text, and match_documents results are
+# reused for queries whose embeddings are nearly identical
+_match_cache = SemanticCache()
+
+@functools.lru_cache(maxsize=1)
+def get_query_embedding_function():
+    """
+    Returns the shared, caching embedding function used for queries.
+    """
+    return CachedEmbeddings(get_embedding_function())
+
+def extract_query_color(query_text):
+    """
+    Returns the first palette color named in the query (lower-cased), or None.
+    """
+    match = _COLOR_RE.search(query_text)
+    return match.group(1).lower() if match else None
+
+def get_products_by_color(supabase_client, color):
+    """
+    Returns the product images whose `colors` JSONB map has `color` set to true.
+
+    The containment filter runs in Postgres and can use a GIN index:
+
+        CREATE INDEX idx_product_images_colors
+            ON product_images USING GIN (colors jsonb_path_ops);
+    """
+    response = (supabase_client.table('product_images')
+                .select('document_id, description, colors')
+                .filter('colors', 'cs', f'{{"{color}":true}}')
+                .execute())
+    return response.data
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("query_text", type=str, nargs='?', help="The query text.")
@@ -36,23 +83,32 @@ def main():
     query_rag(query_text)
 
 def query_rag(query_text: str):
-    print("Creating embedding function...")
-    embedding_function = get_embedding_function()
-    print("Getting Supabase client...")
+    logger.debug("Creating embedding function...")
+    embedding_function = get_query_embedding_function()
+    logger.debug("Getting Supabase client...")
     supabase_client = get_supabase_client()
 
-    print(f"Generating embedding for query: {query_text}")
+    logger.debug("Generating embedding for query: %s", query_text)
     query_embedding = embedding_function.embed_query(query_text)
 
-    print("Calling match_documents function directly...")
-    response = supabase_client.rpc('match_documents', {
-        'query_embedding': query_embedding,
-        'match_count': 5
-    }).execute()
-
-    print(f"Direct function call result: {response.data}")
-
-    if not response.data:
+    # Results are copied in and out of the cache because they are modified below
+    matches = _match_cache.get(query_embedding)
+    if matches is not None:
+        logger.debug("Using cached match_documents result...")
+        matches = copy.deepcopy(matches)
+    else:
+        logger.debug("Calling match_documents function directly...")
+        response = supabase_client.rpc('match_documents', {
+            'query_embedding': query_embedding,
+            'match_count': 5
+        }).execute()
+        matches = response.data
+        if matches:
+            _match_cache.put(query_embedding, copy.deepcopy(matches))
+
+    logger.debug("Direct function call result: %s", matches)
+
+    if not matches:
         print("No results found.")
         return
 
@@ -61,14 +117,18 @@ def query_rag(query_text: str):
         image_descriptions = supabase_client.table('product_images').select('document_id, description').execute()
         image_desc_dict = {item['document_id']: item['description'] for item in image_descriptions.data}
     except Exception as e:
-        print(f"Error fetching image descriptions: {e}")
+        logger.error("Error fetching image descriptions: %s", e)
         image_desc_dict = {}
 
+    # Fetch the matched documents in a single query
+    doc_ids = list({item['metadata']['document_id'] for item in matches})
+    documents = supabase_client.table('documents').select('*').in_('document_id', doc_ids).execute()
+    doc_map = {doc['document_id']: doc for doc in documents.data}
+
     results = []
-    for item in response.data:
-        document_response = supabase_client.table('documents').select('*').eq('document_id', item['metadata']['document_id']).execute()
-        if document_response.data:
-            document_info = document_response.data[0]
+    for item in matches:
+        document_info = doc_map.get(item['metadata']['document_id'])
+        if document_info:
             item['metadata']['product_name'] = document_info.get('product_name', 'Unknown')
             
             # Add image description if available
@@ -81,11 +141,11 @@ def query_rag(query_text: str):
             metadata=item['metadata']
         ))
 
-    # Print detailed information about each retrieved document
-    for i, doc in enumerate(results):
-        print(f"\nDocument {i+1}:")
-        print(f"Content: {doc.page_content[:200]}...")  # Print first 200 characters
-        print(f"Metadata: {doc.metadata}")
+    # Log detailed information about each retrieved document
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, doc in enumerate(results):
+            logger.debug("Document %d:\nContent: %s...\nMetadata: %s",
+                         i + 1, doc.page_content[:200], doc.metadata)
 
     context_text = "\n\n---\n\n".join([
         f"Product: {doc.metadata.get('product_name', 'Unknown')}\n"
@@ -94,15 +154,9 @@ def query_rag(query_text: str):
         for doc in results
     ])
     
-    if 'color' in query_text.lower():
-        color_results = supabase_client.table('product_images').select('*').execute()
-        color_data = color_results.data
-        
-        matching_products = []
-        for product in color_data:
-            if product['colors'].get(query_color, False):
-                matching_products.append(product)
-        
+    query_color = extract_query_color(query_text) if 'color' in query_text.lower() else None
+    if query_color:
+        matching_products = get_products_by_color(supabase_client, query_color)
         context_text += f"\n\nProducts matching color query: {matching_products}"
     
     # Updated prompt template
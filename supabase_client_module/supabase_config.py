@@ -1,15 +1,25 @@
+import functools
+import logging
 import os
 from supabase import create_client, Client  # Keep the import as 'supabase'
 
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
+    """
+    Returns the shared Supabase client, creating it on first use.
+
+    The client is cached so its HTTP connection pool is reused across calls.
+    """
     url: str = os.environ.get("SUPABASE_URL")
     key: str = os.environ.get("SUPABASE_KEY")
     
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
     
-    print(f"Connecting to Supabase URL: {url}")
-    print(f"Using Supabase key: {key[:5]}...{key[-5:]}")  # Print first and last 5 characters of the key
+    # The key is never logged
+    logger.debug("Connecting to Supabase URL: %s", url)
     
     return create_client(url, key)
 